@@ -29,7 +29,7 @@ class BaseAgent(BaseModel, ABC):
     )
 
     # Dependencies
-    llm: LLM = Field(default_factory=LLM, description="Language model instance")
+    llm: LLM = Field(default_factory=LLM.get, description="Language model instance")
     memory: Memory = Field(default_factory=Memory, description="Agent's memory store")
     state: AgentState = Field(
         default=AgentState.IDLE, description="Current agent state"
@@ -49,7 +49,7 @@ class BaseAgent(BaseModel, ABC):
     def initialize_agent(self) -> "BaseAgent":
         """Initialize agent with default settings if not provided."""
         if self.llm is None or not isinstance(self.llm, LLM):
-            self.llm = LLM(config_name=self.name.lower())
+            self.llm = LLM.get(config_name=self.name.lower())
         if not isinstance(self.memory, Memory):
             self.memory = Memory()
         return self
@@ -134,7 +134,7 @@ class BaseAgent(BaseModel, ABC):
                 self.current_step < self.max_steps and self.state != AgentState.FINISHED
             ):
                 self.current_step += 1
-                logger.info(f"Executing step {self.current_step}/{self.max_steps}")
+                logger.info("Executing step {}/{}", self.current_step, self.max_steps)
                 step_result = await self.step()
 
                 # Check for stuck state
@@ -162,7 +162,7 @@ class BaseAgent(BaseModel, ABC):
         stuck_prompt = "\
         Observed duplicate responses. Consider new strategies and avoid repeating ineffective paths already attempted."
         self.next_step_prompt = f"{stuck_prompt}\n{self.next_step_prompt}"
-        logger.warning(f"Agent detected stuck state. Added prompt: {stuck_prompt}")
+        logger.warning("Agent detected stuck state. Added prompt: {}", stuck_prompt)
 
     def is_stuck(self) -> bool:
         """Check if the agent is stuck in a loop by detecting duplicate content"""
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 from pydantic import Field
 
@@ -37,7 +37,17 @@ class Manus(ToolCallAgent):
             PythonExecute(), GoogleSearch(), BrowserUseTool(), FileSaver(), Terminate()
         )
     )
+    # Searches have no side effects, so several in one response can overlap
+    concurrent_tool_names: List[str] = Field(
+        default_factory=lambda: [GoogleSearch.model_fields["name"].default]
+    )
 
     async def _handle_special_tool(self, name: str, result: Any, **kwargs):
-        await self.available_tools.get_tool(BrowserUseTool().name).cleanup()
+        # Keep the browser warm between steps and only close it once the task ends
+        if self._is_special_tool(name):
+            browser = self.available_tools.get_tool(
+                BrowserUseTool.model_fields["name"].default
+            )
+            if browser:
+                await browser.cleanup()
         await super()._handle_special_tool(name, result, **kwargs)
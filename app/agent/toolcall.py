@@ -1,5 +1,7 @@
+import ast
+import asyncio
 import json
-
+from itertools import groupby
 from typing import Any, List, Literal, Optional, Union
 
 from pydantic import Field
@@ -33,6 +35,9 @@ class ToolCallAgent(ReActAgent):
 
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
+    max_concurrent_tools: int = 4
+    # Side-effect free tools whose adjacent calls may overlap; others run in order
+    concurrent_tool_names: List[str] = Field(default_factory=list)
 
     async def think(self) -> bool:
         """Process current state and decide next actions using tools"""
@@ -52,13 +57,16 @@ class ToolCallAgent(ReActAgent):
         self.tool_calls = response.tool_calls
 
         # Log response info
-        logger.info(f"✨ {self.name}'s thoughts: {response.content}")
+        logger.info("✨ {}'s thoughts: {}", self.name, response.content)
         logger.info(
-            f"🛠️ {self.name} selected {len(response.tool_calls) if response.tool_calls else 0} tools to use"
+            "🛠️ {} selected {} tools to use",
+            self.name,
+            len(response.tool_calls) if response.tool_calls else 0,
         )
         if response.tool_calls:
             logger.info(
-                f"🧰 Tools being prepared: {[call.function.name for call in response.tool_calls]}"
+                "🧰 Tools being prepared: {}",
+                [call.function.name for call in response.tool_calls],
             )
 
         try:
@@ -66,7 +74,8 @@ class ToolCallAgent(ReActAgent):
             if self.tool_choices == ToolChoice.NONE:
                 if response.tool_calls:
                     logger.warning(
-                        f"🤔 Hmm, {self.name} tried to use tools when they weren't available!"
+                        "🤔 Hmm, {} tried to use tools when they weren't available!",
+                        self.name,
                     )
                 if response.content:
                     self.memory.add_message(Message.assistant_message(response.content))
@@ -92,7 +101,9 @@ class ToolCallAgent(ReActAgent):
 
             return bool(self.tool_calls)
         except Exception as e:
-            logger.error(f"🚨 Oops! The {self.name}'s thinking process hit a snag: {e}")
+            logger.error(
+                "🚨 Oops! The {}'s thinking process hit a snag: {}", self.name, e
+            )
             self.memory.add_message(
                 Message.assistant_message(
                     f"Error encountered while processing: {str(e)}"
@@ -110,14 +121,14 @@ class ToolCallAgent(ReActAgent):
             return self.messages[-1].content or "No content or commands to execute"
 
         results = []
-        for command in self.tool_calls:
-            result = await self.execute_tool(command)
-
+        for command, result in zip(self.tool_calls, await self._execute_tool_calls()):
             if self.max_observe:
                 result = result[: self.max_observe]
 
             logger.info(
-                f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
+                "🎯 Tool '{}' completed its mission! Result: {}",
+                command.function.name,
+                result,
             )
 
             # Add tool response to memory
@@ -129,6 +140,30 @@ class ToolCallAgent(ReActAgent):
 
         return "\n\n".join(results)
 
+    async def _execute_tool_calls(self) -> List[str]:
+        """Run the pending tool calls in order, overlapping only side-effect free ones"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+
+        async def run(command: ToolCall) -> str:
+            async with semaphore:
+                return await self.execute_tool(command)
+
+        results = []
+        for concurrent, commands in groupby(
+            self.tool_calls,
+            key=lambda command: command.function.name in self.concurrent_tool_names,
+        ):
+            commands = list(commands)
+            if concurrent and len(commands) > 1:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(run(command)) for command in commands]
+                results.extend(task.result() for task in tasks)
+            else:
+                # Other tools may depend on each other's side effects
+                for command in commands:
+                    results.append(await self.execute_tool(command))
+        return results
+
     async def execute_tool(self, command: ToolCall) -> str:
         """Execute a single tool call with robust error handling"""
         if not command or not command.function or not command.function.name:
@@ -140,10 +175,10 @@ class ToolCallAgent(ReActAgent):
 
         try:
             # Parse arguments
-            args = json.loads(command.function.arguments or "{}")
+            args = self._parse_arguments(command.function.arguments or "{}")
 
             # Execute the tool
-            logger.info(f"🔧 Activating tool: '{name}'...")
+            logger.info("🔧 Activating tool: '{}'...", name)
             result = await self.available_tools.execute(name=name, tool_input=args)
 
             # Format result for display
@@ -160,7 +195,9 @@ class ToolCallAgent(ReActAgent):
         except json.JSONDecodeError:
             error_msg = f"Error parsing arguments for {name}: Invalid JSON format"
             logger.error(
-                f"📝 Oops! The arguments for '{name}' don't make sense - invalid JSON, arguments:{command.function.arguments}"
+                "📝 Oops! The arguments for '{}' don't make sense - invalid JSON, arguments:{}",
+                name,
+                command.function.arguments,
             )
             return f"Error: {error_msg}"
         except Exception as e:
@@ -168,6 +205,21 @@ class ToolCallAgent(ReActAgent):
             logger.error(error_msg)
             return f"Error: {error_msg}"
 
+    @staticmethod
+    def _parse_arguments(arguments: str) -> dict:
+        """Parse tool call arguments, tolerating Python dict literals"""
+        try:
+            return json.loads(arguments)
+        except json.JSONDecodeError:
+            # Some models emit single quotes or True/None instead of strict JSON
+            try:
+                args = ast.literal_eval(arguments)
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                args = None
+            if isinstance(args, dict):
+                return args
+            raise
+
     async def _handle_special_tool(self, name: str, result: Any, **kwargs):
         """Handle special tool execution and state changes"""
         if not self._is_special_tool(name):
@@ -175,7 +227,7 @@ class ToolCallAgent(ReActAgent):
 
         if self._should_finish_execution(name=name, result=result, **kwargs):
             # Set agent state to finished
-            logger.info(f"🏁 Special tool '{name}' has completed the task!")
+            logger.info("🏁 Special tool '{}' has completed the task!", name)
             self.state = AgentState.FINISHED
 
     @staticmethod
@@ -186,3 +238,9 @@ class ToolCallAgent(ReActAgent):
     def _is_special_tool(self, name: str) -> bool:
         """Check if tool name is in special tools list"""
         return name.lower() in [n.lower() for n in self.special_tool_names]
+
+    async def cleanup(self):
+        """Release resources held by the agent's tools, e.g. the browser"""
+        for tool in self.available_tools:
+            if hasattr(tool, "cleanup"):
+                await tool.cleanup()
@@ -23,6 +23,15 @@ class LLMSettings(BaseModel):
     temperature: float = Field(1.0, description="Sampling temperature")
     api_type: str = Field(..., description="AzureOpenai or Openai")
     api_version: str = Field(..., description="Azure Openai version if AzureOpenai")
+    enable_prompt_cache: bool = Field(
+        False, description="Mark the static prompt prefix as cacheable"
+    )
+    requests_per_minute: Optional[int] = Field(
+        None, description="Maximum requests per minute, unlimited if not set"
+    )
+    response_cache_size: int = Field(
+        0, description="Number of temperature 0 responses to reuse, disabled if 0"
+    )
 
 
 class ProxySettings(BaseModel):
@@ -114,6 +123,9 @@ class Config:
             "temperature": base_llm.get("temperature", 1.0),
             "api_type": base_llm.get("api_type", ""),
             "api_version": base_llm.get("api_version", ""),
+            "enable_prompt_cache": base_llm.get("enable_prompt_cache", False),
+            "requests_per_minute": base_llm.get("requests_per_minute"),
+            "response_cache_size": base_llm.get("response_cache_size", 0),
         }
 
         # handle browser config.
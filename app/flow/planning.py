@@ -1,4 +1,5 @@
 import json
+import re
 import time
 from typing import Dict, List, Optional, Union
 
@@ -12,10 +13,13 @@ from app.schema import AgentState, Message, ToolChoice
 from app.tool import PlanningTool
 
 
+_STEP_TYPE_RE = re.compile(r"\[([A-Z_]+)\]")
+
+
 class PlanningFlow(BaseFlow):
     """A flow that manages planning and execution of tasks using agents."""
 
-    llm: LLM = Field(default_factory=lambda: LLM())
+    llm: LLM = Field(default_factory=LLM.get)
     planning_tool: PlanningTool = Field(default_factory=PlanningTool)
     executor_keys: List[str] = Field(default_factory=list)
     active_plan_id: str = Field(default_factory=lambda: f"plan_{int(time.time())}")
@@ -192,9 +196,7 @@ class PlanningFlow(BaseFlow):
                     step_info = {"text": step}
 
                     # Try to extract step type from the text (e.g., [SEARCH] or [CODE])
-                    import re
-
-                    type_match = re.search(r"\[([A-Z_]+)\]", step)
+                    type_match = _STEP_TYPE_RE.search(step)
                     if type_match:
                         step_info["type"] = type_match.group(1).lower()
 
@@ -326,15 +328,16 @@ class PlanningFlow(BaseFlow):
             total = len(steps)
             progress = (completed / total) * 100 if total > 0 else 0
 
-            plan_text = f"Plan: {title} (ID: {self.active_plan_id})\n"
-            plan_text += "=" * len(plan_text) + "\n\n"
-
-            plan_text += (
-                f"Progress: {completed}/{total} steps completed ({progress:.1f}%)\n"
-            )
-            plan_text += f"Status: {status_counts[PlanStepStatus.COMPLETED.value]} completed, {status_counts[PlanStepStatus.IN_PROGRESS.value]} in progress, "
-            plan_text += f"{status_counts[PlanStepStatus.BLOCKED.value]} blocked, {status_counts[PlanStepStatus.NOT_STARTED.value]} not started\n\n"
-            plan_text += "Steps:\n"
+            header = f"Plan: {title} (ID: {self.active_plan_id})\n"
+            parts = [
+                header,
+                "=" * len(header),
+                "\n\n",
+                f"Progress: {completed}/{total} steps completed ({progress:.1f}%)\n",
+                f"Status: {status_counts[PlanStepStatus.COMPLETED.value]} completed, {status_counts[PlanStepStatus.IN_PROGRESS.value]} in progress, ",
+                f"{status_counts[PlanStepStatus.BLOCKED.value]} blocked, {status_counts[PlanStepStatus.NOT_STARTED.value]} not started\n\n",
+                "Steps:\n",
+            ]
 
             status_marks = PlanStepStatus.get_status_marks()
 
@@ -346,11 +349,11 @@ class PlanningFlow(BaseFlow):
                     status, status_marks[PlanStepStatus.NOT_STARTED.value]
                 )
 
-                plan_text += f"{i}. {status_mark} {step}\n"
+                parts.append(f"{i}. {status_mark} {step}\n")
                 if notes:
-                    plan_text += f"   Notes: {notes}\n"
+                    parts.append(f"   Notes: {notes}\n")
 
-            return plan_text
+            return "".join(parts)
         except Exception as e:
             logger.error(f"Error generating plan text from storage: {e}")
             return f"Error: Unable to retrieve plan with ID {self.active_plan_id}"
@@ -1,61 +1,158 @@
-from typing import Dict, List, Optional, Union
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import sys
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
 from openai import (
     APIError,
     AsyncAzureOpenAI,
     AsyncOpenAI,
     AuthenticationError,
+    NotFoundError,
     OpenAIError,
     RateLimitError,
 )
-from tenacity import retry, stop_after_attempt, wait_random_exponential
+from openai.types.chat import ChatCompletionMessage
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_random_exponential
 
 from app.config import LLMSettings, config
 from app.logger import logger  # Assuming a logger is set up in your app
-from app.schema import Message, TOOL_CHOICE_TYPE, ROLE_VALUES, TOOL_CHOICE_VALUES, ToolChoice
+from app.schema import (
+    ROLE_VALUES,
+    TOOL_CHOICE_TYPE,
+    TOOL_CHOICE_VALUES,
+    Message,
+    ToolChoice,
+)
+
+
+_backoff = wait_random_exponential(min=1, max=60)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """Wait as long as a rate-limited provider asks, else back off exponentially."""
+    exc = retry_state.outcome.exception()
+    if isinstance(exc, RateLimitError):
+        try:
+            return min(float(exc.response.headers["retry-after"]), 60)
+        except (KeyError, ValueError):
+            pass
+    return _backoff(retry_state)
+
+
+class RateLimiter:
+    """Token bucket allowing `rate` requests per `period` seconds."""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = rate
+        self._fill_rate = rate / period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self._fill_rate,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._fill_rate)
+
+
+class StreamPrinter:
+    """Buffers streamed response chunks and writes them to stdout in batches."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def __call__(self, chunk: str) -> None:
+        self._pending.append(chunk)
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out any buffered chunks."""
+        if self._pending:
+            sys.stdout.write("".join(self._pending))
+            sys.stdout.flush()
+            self._pending.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush the remaining chunks and end the line."""
+        self._pending.append("\n")
+        self.flush()
 
 
 class LLM:
     _instances: Dict[str, "LLM"] = {}
 
-    def __new__(
-        cls, config_name: str = "default", llm_config: Optional[LLMSettings] = None
-    ):
-        if config_name not in cls._instances:
-            instance = super().__new__(cls)
-            instance.__init__(config_name, llm_config)
-            cls._instances[config_name] = instance
-        return cls._instances[config_name]
-
     def __init__(
         self, config_name: str = "default", llm_config: Optional[LLMSettings] = None
     ):
-        if not hasattr(self, "client"):  # Only initialize if not already initialized
-            llm_config = llm_config or config.llm
-            llm_config = llm_config.get(config_name, llm_config["default"])
-            self.model = llm_config.model
-            self.max_tokens = llm_config.max_tokens
-            self.temperature = llm_config.temperature
-            self.api_type = llm_config.api_type
-            self.api_key = llm_config.api_key
-            self.api_version = llm_config.api_version
-            self.base_url = llm_config.base_url
-            if self.api_type == "azure":
-                self.client = AsyncAzureOpenAI(
-                    base_url=self.base_url,
-                    api_key=self.api_key,
-                    api_version=self.api_version,
-                )
-            else:
-                self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        llm_config = llm_config or config.llm
+        llm_config = llm_config.get(config_name, llm_config["default"])
+        self.model = llm_config.model
+        self.max_tokens = llm_config.max_tokens
+        self.temperature = llm_config.temperature
+        self.api_type = llm_config.api_type
+        self.api_key = llm_config.api_key
+        self.api_version = llm_config.api_version
+        self.base_url = llm_config.base_url
+        self.enable_prompt_cache = llm_config.enable_prompt_cache
+        self.response_cache_size = llm_config.response_cache_size
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+        if self.api_type == "azure":
+            self.client = AsyncAzureOpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key,
+                api_version=self.api_version,
+            )
+        else:
+            self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+        # Request arguments that are fixed for the lifetime of this client
+        self._default_kwargs = {"model": self.model, "max_tokens": self.max_tokens}
+        self._rate_limiter = (
+            RateLimiter(llm_config.requests_per_minute)
+            if llm_config.requests_per_minute
+            else None
+        )
+
+    @classmethod
+    def get(
+        cls, config_name: str = "default", llm_config: Optional[LLMSettings] = None
+    ) -> "LLM":
+        """Return the shared LLM for `config_name`, creating it on first use."""
+        if config_name not in cls._instances:
+            cls._instances[config_name] = cls(config_name, llm_config)
+        return cls._instances[config_name]
 
     @staticmethod
-    def format_messages(messages: List[Union[dict, Message]]) -> List[dict]:
+    def format_messages(
+        messages: List[Union[dict, Message]],
+        prefix: Optional[List[Union[dict, Message]]] = None,
+    ) -> List[dict]:
         """
         Format messages for LLM by converting them to OpenAI message format.
 
         Args:
             messages: List of messages that can be either dict or Message objects
+            prefix: Optional messages (e.g. system messages) to place before `messages`
 
         Returns:
             List[dict]: List of formatted messages in OpenAI format
@@ -74,31 +171,83 @@ class LLM:
         """
         formatted_messages = []
 
-        for message in messages:
+        # Convert and validate in a single pass over prefix and messages
+        for message in itertools.chain(prefix or (), messages):
             if isinstance(message, dict):
                 # If message is already a dict, ensure it has required fields
                 if "role" not in message:
                     raise ValueError("Message dict must contain 'role' field")
-                formatted_messages.append(message)
             elif isinstance(message, Message):
                 # If message is a Message object, convert it to dict
-                formatted_messages.append(message.to_dict())
+                message = message.to_dict()
             else:
                 raise TypeError(f"Unsupported message type: {type(message)}")
 
-        # Validate all messages have required fields
-        for msg in formatted_messages:
-            if msg["role"] not in ROLE_VALUES:
-                raise ValueError(f"Invalid role: {msg['role']}")
-            if "content" not in msg and "tool_calls" not in msg:
+            if message["role"] not in ROLE_VALUES:
+                raise ValueError(f"Invalid role: {message['role']}")
+            if "content" not in message and "tool_calls" not in message:
                 raise ValueError(
                     "Message must contain either 'content' or 'tool_calls'"
                 )
+            formatted_messages.append(message)
 
         return formatted_messages
 
+    @classmethod
+    def format_system_messages(
+        cls, system_msgs: List[Union[dict, Message]]
+    ) -> List[dict]:
+        """
+        Format system messages, reusing the result for prompts seen before.
+
+        Agents resend the same system prompt on every step, so plain role/content
+        messages are formatted once and served from a cache afterwards. Messages
+        carrying other fields are formatted as usual.
+
+        Args:
+            system_msgs: List of system messages as dicts or Message objects
+
+        Returns:
+            List[dict]: Fresh copies of the formatted messages, safe to modify
+        """
+        key = []
+        for msg in system_msgs:
+            if isinstance(msg, Message):
+                if msg.tool_calls or msg.name or msg.tool_call_id:
+                    break
+                key.append((msg.role, msg.content))
+            elif (
+                isinstance(msg, dict)
+                and msg.keys() == {"role", "content"}
+                and isinstance(msg["content"], str)
+            ):
+                key.append((msg["role"], msg["content"]))
+            else:
+                break
+        else:
+            return [dict(msg) for msg in cls._format_cached(tuple(key))]
+        # format_messages passes dicts through as-is; copy them for the caller
+        return [dict(msg) for msg in cls.format_messages(system_msgs)]
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _format_cached(
+        cls, key: Tuple[Tuple[str, Optional[str]], ...]
+    ) -> Tuple[dict, ...]:
+        """Format (role, content) pairs; memoized by `format_system_messages`."""
+        return tuple(
+            cls.format_messages(
+                [
+                    {"role": role, "content": content}
+                    if content is not None
+                    else {"role": role}
+                    for role, content in key
+                ]
+            )
+        )
+
     @retry(
-        wait=wait_random_exponential(min=1, max=60),
+        wait=_wait_retry_after,
         stop=stop_after_attempt(6),
     )
     async def ask(
@@ -107,6 +256,7 @@ class LLM:
         system_msgs: Optional[List[Union[dict, Message]]] = None,
         stream: bool = True,
         temperature: Optional[float] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
     ) -> str:
         """
         Send a prompt to the LLM and get the response.
@@ -116,6 +266,8 @@ class LLM:
             system_msgs: Optional system messages to prepend
             stream (bool): Whether to stream the response
             temperature (float): Sampling temperature for the response
+            on_chunk: Optional callback receiving each streamed chunk; streamed
+                output is printed to stdout when not provided
 
         Returns:
             str: The generated response
@@ -128,43 +280,52 @@ class LLM:
         try:
             # Format system and user messages
             if system_msgs:
-                system_msgs = self.format_messages(system_msgs)
-                messages = system_msgs + self.format_messages(messages)
-            else:
-                messages = self.format_messages(messages)
+                system_msgs = self.format_system_messages(system_msgs)
+            messages = self.format_messages(messages, prefix=system_msgs)
+
+            # Deterministic requests can be answered from an earlier response
+            cache_key = self._response_cache_key(messages, temperature)
+            if cache_key is not None and cache_key in self._response_cache:
+                self._response_cache.move_to_end(cache_key)
+                full_response = self._response_cache[cache_key]
+                if stream:
+                    writer = on_chunk or StreamPrinter()
+                    writer(full_response)
+                    if on_chunk is None:
+                        writer.close()
+                return full_response
 
             if not stream:
                 # Non-streaming request
-                response = await self.client.chat.completions.create(
-                    model=self.model,
+                response = await self._create(
                     messages=messages,
-                    max_tokens=self.max_tokens,
                     temperature=temperature or self.temperature,
                     stream=False,
                 )
                 if not response.choices or not response.choices[0].message.content:
                     raise ValueError("Empty or invalid response from LLM")
-                return response.choices[0].message.content
-
-            # Streaming request
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=self.max_tokens,
-                temperature=temperature or self.temperature,
-                stream=True,
-            )
-
-            collected_messages = []
-            async for chunk in response:
-                chunk_message = chunk.choices[0].delta.content or ""
-                collected_messages.append(chunk_message)
-                print(chunk_message, end="", flush=True)
-
-            print()  # Newline after streaming
-            full_response = "".join(collected_messages).strip()
-            if not full_response:
-                raise ValueError("Empty response from streaming LLM")
+                full_response = response.choices[0].message.content
+            else:
+                # Streaming request
+                writer = on_chunk or StreamPrinter()
+                collected = io.StringIO()
+                try:
+                    async for chunk_message in self._stream(messages, temperature):
+                        collected.write(chunk_message)
+                        writer(chunk_message)
+                finally:
+                    # Flush partial output and end the line even if the stream
+                    # fails, so a retry starts on a fresh line
+                    if on_chunk is None:
+                        writer.close()
+                full_response = collected.getvalue().strip()
+                if not full_response:
+                    raise ValueError("Empty response from streaming LLM")
+
+            if cache_key is not None:
+                self._response_cache[cache_key] = full_response
+                if len(self._response_cache) > self.response_cache_size:
+                    self._response_cache.popitem(last=False)
             return full_response
 
         except ValueError as ve:
@@ -177,8 +338,85 @@ class LLM:
             logger.error(f"Unexpected error in ask: {e}")
             raise
 
+    def _response_cache_key(
+        self, messages: List[dict], temperature: Optional[float]
+    ) -> Optional[str]:
+        """Cache key for a request, or None if its response should not be cached."""
+        if not self.response_cache_size or (temperature or self.temperature) != 0:
+            return None
+        request = json.dumps(
+            {**self._default_kwargs, "messages": messages}, sort_keys=True
+        )
+        return hashlib.sha256(request.encode()).hexdigest()
+
+    async def _create(self, **kwargs):
+        """Create a chat completion with this client's default arguments applied."""
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
+        return await self.client.chat.completions.create(
+            **{**self._default_kwargs, **kwargs}
+        )
+
+    async def _stream(
+        self, messages: List[dict], temperature: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """Stream a completion for formatted messages, yielding content deltas."""
+        response = await self._create(
+            messages=messages,
+            temperature=temperature or self.temperature,
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk.choices[0].delta.content or ""
+
+    def _apply_prompt_cache(
+        self,
+        system_msgs: Optional[List[dict]],
+        tools: Optional[List[dict]],
+        kwargs: dict,
+    ) -> dict:
+        """
+        Mark the static prompt prefix (tools and system prompt) as cacheable.
+
+        Anthropic models get an ephemeral cache breakpoint on the last system
+        message, which covers the tools as well. OpenAI models get a stable
+        `prompt_cache_key` so requests sharing the prefix hit the same cache;
+        other endpoints may reject unknown parameters and are left alone.
+
+        Args:
+            system_msgs: Formatted system messages; the last entry is replaced
+            tools: List of tools sent with the request
+            kwargs: Additional completion arguments
+
+        Returns:
+            dict: The completion arguments to use for the request
+        """
+        if self.model.startswith(("claude", "anthropic/")):
+            if system_msgs and isinstance(system_msgs[-1].get("content"), str):
+                system_msgs[-1] = {
+                    **system_msgs[-1],
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": system_msgs[-1]["content"],
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                }
+            return kwargs
+
+        if self.api_type.lower() != "openai":
+            return kwargs
+
+        prefix = json.dumps([system_msgs or [], tools or []], sort_keys=True)
+        extra_body = {
+            **kwargs.get("extra_body", {}),
+            "prompt_cache_key": hashlib.sha256(prefix.encode()).hexdigest(),
+        }
+        return {**kwargs, "extra_body": extra_body}
+
     @retry(
-        wait=wait_random_exponential(min=1, max=60),
+        wait=_wait_retry_after,
         stop=stop_after_attempt(6),
     )
     async def ask_tool(
@@ -187,7 +425,7 @@ class LLM:
         system_msgs: Optional[List[Union[dict, Message]]] = None,
         timeout: int = 300,
         tools: Optional[List[dict]] = None,
-        tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO, # type: ignore
+        tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
         temperature: Optional[float] = None,
         **kwargs,
     ):
@@ -216,25 +454,23 @@ class LLM:
             if tool_choice not in TOOL_CHOICE_VALUES:
                 raise ValueError(f"Invalid tool_choice: {tool_choice}")
 
-            # Format messages
-            if system_msgs:
-                system_msgs = self.format_messages(system_msgs)
-                messages = system_msgs + self.format_messages(messages)
-            else:
-                messages = self.format_messages(messages)
-
             # Validate tools if provided
             if tools:
                 for tool in tools:
                     if not isinstance(tool, dict) or "type" not in tool:
                         raise ValueError("Each tool must be a dict with 'type' field")
 
+            # Format messages
+            if system_msgs:
+                system_msgs = self.format_system_messages(system_msgs)
+            if self.enable_prompt_cache:
+                kwargs = self._apply_prompt_cache(system_msgs, tools, kwargs)
+            messages = self.format_messages(messages, prefix=system_msgs)
+
             # Set up the completion request
-            response = await self.client.chat.completions.create(
-                model=self.model,
+            response = await self._create(
                 messages=messages,
                 temperature=temperature or self.temperature,
-                max_tokens=self.max_tokens,
                 tools=tools,
                 tool_choice=tool_choice,
                 timeout=timeout,
@@ -262,3 +498,221 @@ class LLM:
         except Exception as e:
             logger.error(f"Unexpected error in ask_tool: {e}")
             raise
+
+    async def ask_tool_batch(
+        self, calls: List[dict]
+    ) -> List[Union[ChatCompletionMessage, BaseException]]:
+        """
+        Run several `ask_tool` requests concurrently.
+
+        All requests are submitted before any is awaited, so the batch takes
+        roughly as long as its slowest request instead of the sum of all of them.
+
+        Args:
+            calls: List of keyword argument dicts, one per `ask_tool` call
+
+        Returns:
+            List: The model's response for each call, in input order. A call that
+                failed after retries yields its exception instead of a response.
+        """
+        return await asyncio.gather(
+            *(self.ask_tool(**call) for call in calls), return_exceptions=True
+        )
+
+    async def ask_many(
+        self,
+        batches: List[List[Union[dict, Message]]],
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> List[str]:
+        """
+        Send several independent prompts to the LLM concurrently.
+
+        Args:
+            batches: List of message lists, one per request
+            max_concurrency: Maximum number of requests in flight at once;
+                unlimited when None. Keep it below the provider's rate limit.
+            **kwargs: Additional arguments forwarded to `ask`
+
+        Returns:
+            List[str]: The generated responses, in input order
+        """
+        tasks = [
+            asyncio.create_task(coro)
+            for coro in self._ask_coros(batches, max_concurrency, **kwargs)
+        ]
+        return await asyncio.gather(*tasks)
+
+    async def ask_as_completed(
+        self,
+        batches: List[List[Union[dict, Message]]],
+        max_concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """
+        Send several independent prompts concurrently and yield responses as they arrive.
+
+        Args:
+            batches: List of message lists, one per request
+            max_concurrency: Maximum number of requests in flight at once;
+                unlimited when None
+            **kwargs: Additional arguments forwarded to `ask`
+
+        Yields:
+            Tuple[int, str]: The index of the request in `batches` and its response
+        """
+
+        async def indexed(index: int, coro) -> Tuple[int, str]:
+            return index, await coro
+
+        tasks = [
+            asyncio.create_task(indexed(i, coro))
+            for i, coro in enumerate(
+                self._ask_coros(batches, max_concurrency, **kwargs)
+            )
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _ask_coros(
+        self,
+        batches: List[List[Union[dict, Message]]],
+        max_concurrency: Optional[int],
+        **kwargs,
+    ) -> List:
+        """Build non-streaming `ask` coroutines, bounded by a shared semaphore."""
+        kwargs["stream"] = False
+        if not max_concurrency:
+            return [self.ask(messages, **kwargs) for messages in batches]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def bounded(messages):
+            async with semaphore:
+                return await self.ask(messages, **kwargs)
+
+        return [bounded(messages) for messages in batches]
+
+    async def submit_batch(
+        self,
+        batches: List[List[Union[dict, Message]]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        temperature: Optional[float] = None,
+    ) -> str:
+        """
+        Submit prompts to the provider's batch endpoint for offline processing.
+
+        Batch requests are billed at a discount and complete within 24 hours,
+        which suits evaluation-style bulk runs that do not need answers right away.
+
+        Args:
+            batches: List of message lists, one per request
+            system_msgs: Optional system messages to prepend to every request
+            temperature: Sampling temperature for the responses
+
+        Returns:
+            str: The id of the created batch, to be passed to `poll_batch`
+
+        Raises:
+            OpenAIError: If the upload or batch creation fails
+        """
+        system_msgs = self.format_system_messages(system_msgs) if system_msgs else []
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        **self._default_kwargs,
+                        "messages": self.format_messages(messages, prefix=system_msgs),
+                        "temperature": temperature or self.temperature,
+                    },
+                }
+            )
+            for i, messages in enumerate(batches)
+        ]
+        batch_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+        return batch.id
+
+    async def poll_batch(self, batch_id: str) -> Optional[List[Optional[str]]]:
+        """
+        Check a batch submitted with `submit_batch` and fetch its results once done.
+
+        Args:
+            batch_id: The id returned by `submit_batch`
+
+        Returns:
+            Optional[List[Optional[str]]]: None while the batch is still running,
+                otherwise the response for each request in submission order
+                (None for requests that failed)
+
+        Raises:
+            ValueError: If the batch failed, expired or was cancelled
+        """
+        batch = await self.client.batches.retrieve(batch_id)
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise ValueError(f"Batch {batch_id} ended with status: {batch.status}")
+        if batch.status != "completed":
+            return None
+
+        results: List[Optional[str]] = [None] * batch.request_counts.total
+        if batch.output_file_id:
+            content = await self.client.files.content(batch.output_file_id)
+            for line in content.text.splitlines():
+                item = json.loads(line)
+                response = item.get("response") or {}
+                if response.get("status_code") == 200:
+                    choices = response["body"]["choices"]
+                    results[int(item["custom_id"])] = choices[0]["message"]["content"]
+        return results
+
+    async def ask_batch(
+        self,
+        batches: List[List[Union[dict, Message]]],
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        temperature: Optional[float] = None,
+        poll_interval: float = 60,
+    ) -> List[Optional[str]]:
+        """
+        Run prompts through the provider's batch endpoint and wait for the results.
+
+        Falls back to concurrent `ask_many` requests when the configured endpoint
+        does not provide a batch API.
+
+        Args:
+            batches: List of message lists, one per request
+            system_msgs: Optional system messages to prepend to every request
+            temperature: Sampling temperature for the responses
+            poll_interval: Seconds to wait between batch status checks
+
+        Returns:
+            List[Optional[str]]: The response for each request, in input order
+        """
+        try:
+            batch_id = await self.submit_batch(batches, system_msgs, temperature)
+        except NotFoundError:
+            logger.warning(
+                "Batch API not available for this endpoint, sending requests concurrently"
+            )
+            system_msgs = system_msgs or []
+            return await self.ask_many(
+                [system_msgs + messages for messages in batches],
+                temperature=temperature,
+            )
+
+        while (results := await self.poll_batch(batch_id)) is None:
+            await asyncio.sleep(poll_interval)
+        return results
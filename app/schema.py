@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Any, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 class Role(str, Enum):
     """Message role options"""
@@ -44,6 +44,10 @@ class ToolCall(BaseModel):
     function: Function
 
 
+# Built once so to_dict reuses the compiled serializer for the whole list
+_TOOL_CALLS_ADAPTER = TypeAdapter(List[ToolCall])
+
+
 class Message(BaseModel):
     """Represents a chat message in the conversation"""
 
@@ -79,7 +83,7 @@ class Message(BaseModel):
         if self.content is not None:
             message["content"] = self.content
         if self.tool_calls is not None:
-            message["tool_calls"] = [tool_call.dict() for tool_call in self.tool_calls]
+            message["tool_calls"] = _TOOL_CALLS_ADAPTER.dump_python(self.tool_calls)
         if self.name is not None:
             message["name"] = self.name
         if self.tool_call_id is not None:
@@ -132,13 +136,18 @@ class Memory(BaseModel):
     def add_message(self, message: Message) -> None:
         """Add a message to memory"""
         self.messages.append(message)
-        # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
 
     def add_messages(self, messages: List[Message]) -> None:
         """Add multiple messages to memory"""
         self.messages.extend(messages)
+        self._trim()
+
+    def _trim(self) -> None:
+        """Drop the oldest messages beyond the limit, in place"""
+        overflow = len(self.messages) - self.max_messages
+        if overflow > 0:
+            del self.messages[:overflow]
 
     def clear(self) -> None:
         """Clear all messages"""
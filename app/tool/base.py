@@ -66,8 +66,7 @@ class ToolResult(BaseModel):
 
     def replace(self, **kwargs):
         """Returns a new ToolResult with the given fields replaced."""
-        # return self.copy(update=kwargs)
-        return type(self)(**{**self.dict(), **kwargs})
+        return self.model_copy(update=kwargs)
 
 
 class CLIResult(ToolResult):
@@ -23,6 +23,8 @@ class _BashSession:
     _output_delay: float = 0.2  # seconds
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
+    _sentinel_bytes: bytes = _sentinel.encode()
+    _sentinel_command: bytes = f"; echo '{_sentinel}'\n".encode()
 
     def __init__(self):
         self._started = False
@@ -72,9 +74,7 @@ class _BashSession:
         assert self._process.stderr
 
         # send command to the process
-        self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
-        )
+        self._process.stdin.writelines((command.encode(), self._sentinel_command))
         await self._process.stdin.drain()
 
         # read output from the process, until the sentinel is found
@@ -84,12 +84,14 @@ class _BashSession:
                     await asyncio.sleep(self._output_delay)
                     # if we read directly from stdout/stderr, it will wait forever for
                     # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
+                    buffer = (
+                        self._process.stdout._buffer
                     )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
+                    # search the raw bytes so the output is only decoded once
+                    end = buffer.find(self._sentinel_bytes)
+                    if end != -1:
                         # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
+                        output = buffer[:end].decode()
                         break
         except asyncio.TimeoutError:
             self._timed_out = True
@@ -1,12 +1,14 @@
 import asyncio
-import json
-from typing import Optional
+import re
+import time
+from typing import Awaitable, Callable, ClassVar, Dict, Optional, Tuple
 
 from browser_use import Browser as BrowserUseBrowser
 from browser_use import BrowserConfig
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.dom.service import DomService
 from pydantic import Field, field_validator
+from pydantic_core import to_json
 from pydantic_core.core_schema import ValidationInfo
 
 from app.config import config
@@ -15,10 +17,23 @@ from app.tool.base import BaseTool, ToolResult
 
 MAX_LENGTH = 2000
 
+# A repeated navigate to the page we are already on is skipped for this long
+NAVIGATION_REUSE_SECONDS = 30
+
+# Actions that only read the page and leave the current URL as it is
+_READ_ONLY_ACTIONS = frozenset({"screenshot", "get_html", "get_text", "read_links"})
+
+_ActionHandler = Callable[..., Awaitable[ToolResult]]
+
+# Page text carries trailing spaces and blank-line runs that only cost tokens;
+# leading indentation and tabs are kept since code and tables depend on them
+_TRAILING_SPACE_RE = re.compile(r"[ \t\f\v\r\xa0]+$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
 _BROWSER_DESCRIPTION = """
 Interact with a web browser to perform various actions such as navigation, element interaction,
 content extraction, and tab management. Supported actions include:
-- 'navigate': Go to a specific URL
+- 'navigate': Go to a specific URL (does nothing if the page is already there; use 'refresh' to reload)
 - 'click': Click an element by index
 - 'input_text': Input text into an element
 - 'screenshot': Capture a screenshot
@@ -49,6 +64,7 @@ class BrowserUseTool(BaseTool):
                     "screenshot",
                     "get_html",
                     "get_text",
+                    "read_links",
                     "execute_js",
                     "scroll",
                     "switch_tab",
@@ -96,6 +112,10 @@ class BrowserUseTool(BaseTool):
     browser: Optional[BrowserUseBrowser] = Field(default=None, exclude=True)
     context: Optional[BrowserContext] = Field(default=None, exclude=True)
     dom_service: Optional[DomService] = Field(default=None, exclude=True)
+    # Requested URL, URL the page landed on, and when the navigation happened
+    last_navigation: Optional[Tuple[str, str, float]] = Field(
+        default=None, exclude=True
+    )
 
     @field_validator("parameters", mode="before")
     def validate_parameters(cls, v: dict, info: ValidationInfo) -> dict:
@@ -179,114 +199,168 @@ class BrowserUseTool(BaseTool):
         Returns:
             ToolResult with the action's output or error
         """
+        # Reject unknown actions before taking the lock or launching a browser
+        if action not in self._DISPATCH:
+            return ToolResult(error=f"Unknown action: {action}")
+        handler, handler_args = self._DISPATCH[action]
+        values = {
+            "url": url,
+            "index": index,
+            "text": text,
+            "script": script,
+            "scroll_amount": scroll_amount,
+            "tab_id": tab_id,
+        }
+
         async with self.lock:
             try:
                 context = await self._ensure_browser_initialized()
-
-                if action == "navigate":
-                    if not url:
-                        return ToolResult(error="URL is required for 'navigate' action")
-                    await context.navigate_to(url)
-                    return ToolResult(output=f"Navigated to {url}")
-
-                elif action == "click":
-                    if index is None:
-                        return ToolResult(error="Index is required for 'click' action")
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    download_path = await context._click_element_node(element)
-                    output = f"Clicked element at index {index}"
-                    if download_path:
-                        output += f" - Downloaded file to {download_path}"
-                    return ToolResult(output=output)
-
-                elif action == "input_text":
-                    if index is None or not text:
-                        return ToolResult(
-                            error="Index and text are required for 'input_text' action"
-                        )
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    await context._input_text_element_node(element, text)
-                    return ToolResult(
-                        output=f"Input '{text}' into element at index {index}"
-                    )
-
-                elif action == "screenshot":
-                    screenshot = await context.take_screenshot(full_page=True)
-                    return ToolResult(
-                        output=f"Screenshot captured (base64 length: {len(screenshot)})",
-                        system=screenshot,
-                    )
-
-                elif action == "get_html":
-                    html = await context.get_page_html()
-                    truncated = (
-                        html[:MAX_LENGTH] + "..." if len(html) > MAX_LENGTH else html
-                    )
-                    return ToolResult(output=truncated)
-
-                elif action == "get_text":
-                    text = await context.execute_javascript("document.body.innerText")
-                    return ToolResult(output=text)
-
-                elif action == "read_links":
-                    links = await context.execute_javascript(
-                        "document.querySelectorAll('a[href]').forEach((elem) => {if (elem.innerText) {console.log(elem.innerText, elem.href)}})"
-                    )
-                    return ToolResult(output=links)
-
-                elif action == "execute_js":
-                    if not script:
-                        return ToolResult(
-                            error="Script is required for 'execute_js' action"
-                        )
-                    result = await context.execute_javascript(script)
-                    return ToolResult(output=str(result))
-
-                elif action == "scroll":
-                    if scroll_amount is None:
-                        return ToolResult(
-                            error="Scroll amount is required for 'scroll' action"
-                        )
-                    await context.execute_javascript(
-                        f"window.scrollBy(0, {scroll_amount});"
-                    )
-                    direction = "down" if scroll_amount > 0 else "up"
-                    return ToolResult(
-                        output=f"Scrolled {direction} by {abs(scroll_amount)} pixels"
-                    )
-
-                elif action == "switch_tab":
-                    if tab_id is None:
-                        return ToolResult(
-                            error="Tab ID is required for 'switch_tab' action"
-                        )
-                    await context.switch_to_tab(tab_id)
-                    return ToolResult(output=f"Switched to tab {tab_id}")
-
-                elif action == "new_tab":
-                    if not url:
-                        return ToolResult(error="URL is required for 'new_tab' action")
-                    await context.create_new_tab(url)
-                    return ToolResult(output=f"Opened new tab with URL {url}")
-
-                elif action == "close_tab":
-                    await context.close_current_tab()
-                    return ToolResult(output="Closed current tab")
-
-                elif action == "refresh":
-                    await context.refresh_page()
-                    return ToolResult(output="Refreshed current page")
-
-                else:
-                    return ToolResult(error=f"Unknown action: {action}")
-
+                if action != "navigate" and action not in _READ_ONLY_ACTIONS:
+                    # Anything else may have moved the page away from the last URL
+                    self.last_navigation = None
+                return await handler(
+                    self, context, **{name: values[name] for name in handler_args}
+                )
             except Exception as e:
                 return ToolResult(error=f"Browser action '{action}' failed: {str(e)}")
 
+    async def _navigate(
+        self, context: BrowserContext, url: Optional[str]
+    ) -> ToolResult:
+        if not url:
+            return ToolResult(error="URL is required for 'navigate' action")
+        # Agents often retry or backtrack to the page they just loaded
+        page = await context.get_current_page()
+        if self.last_navigation is not None:
+            last_url, landed_url, navigated_at = self.last_navigation
+            # The page may have moved on by itself, e.g. through a JS redirect
+            if (
+                last_url == url
+                and page.url == landed_url
+                and time.monotonic() - navigated_at < NAVIGATION_REUSE_SECONDS
+            ):
+                return ToolResult(
+                    output=f"Already at {url}; use 'refresh' to reload the page"
+                )
+        self.last_navigation = None
+        await context.navigate_to(url)
+        page = await context.get_current_page()
+        self.last_navigation = (url, page.url, time.monotonic())
+        return ToolResult(output=f"Navigated to {url}")
+
+    async def _click(self, context: BrowserContext, index: Optional[int]) -> ToolResult:
+        if index is None:
+            return ToolResult(error="Index is required for 'click' action")
+        element = await context.get_dom_element_by_index(index)
+        if not element:
+            return ToolResult(error=f"Element with index {index} not found")
+        download_path = await context._click_element_node(element)
+        output = f"Clicked element at index {index}"
+        if download_path:
+            output += f" - Downloaded file to {download_path}"
+        return ToolResult(output=output)
+
+    async def _input_text(
+        self, context: BrowserContext, index: Optional[int], text: Optional[str]
+    ) -> ToolResult:
+        if index is None or not text:
+            return ToolResult(
+                error="Index and text are required for 'input_text' action"
+            )
+        element = await context.get_dom_element_by_index(index)
+        if not element:
+            return ToolResult(error=f"Element with index {index} not found")
+        await context._input_text_element_node(element, text)
+        return ToolResult(output=f"Input '{text}' into element at index {index}")
+
+    async def _screenshot(self, context: BrowserContext) -> ToolResult:
+        screenshot = await context.take_screenshot(full_page=True)
+        return ToolResult(
+            output=f"Screenshot captured (base64 length: {len(screenshot)})",
+            system=screenshot,
+        )
+
+    async def _get_html(self, context: BrowserContext) -> ToolResult:
+        # Truncate inside the page so only the part we keep crosses the IPC boundary
+        html = await context.execute_javascript(
+            f"document.documentElement.outerHTML.slice(0, {MAX_LENGTH + 1})"
+        )
+        truncated = html[:MAX_LENGTH] + "..." if len(html) > MAX_LENGTH else html
+        return ToolResult(output=truncated)
+
+    async def _get_text(self, context: BrowserContext) -> ToolResult:
+        text = await context.execute_javascript("document.body.innerText")
+        text = _TRAILING_SPACE_RE.sub("", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+        return ToolResult(output=text.strip("\n"))
+
+    async def _read_links(self, context: BrowserContext) -> ToolResult:
+        # Collect every link in one evaluate call and return it, rather than
+        # logging each one to the page console
+        links = await context.execute_javascript(
+            "Array.from(document.querySelectorAll('a[href]'))"
+            ".filter((elem) => elem.innerText.trim())"
+            ".map((elem) => elem.innerText.trim() + ' ' + elem.href)"
+            ".join('\\n')"
+        )
+        return ToolResult(output=links)
+
+    async def _execute_js(
+        self, context: BrowserContext, script: Optional[str]
+    ) -> ToolResult:
+        if not script:
+            return ToolResult(error="Script is required for 'execute_js' action")
+        result = await context.execute_javascript(script)
+        return ToolResult(output=str(result))
+
+    async def _scroll(
+        self, context: BrowserContext, scroll_amount: Optional[int]
+    ) -> ToolResult:
+        if scroll_amount is None:
+            return ToolResult(error="Scroll amount is required for 'scroll' action")
+        await context.execute_javascript(f"window.scrollBy(0, {scroll_amount});")
+        direction = "down" if scroll_amount > 0 else "up"
+        return ToolResult(output=f"Scrolled {direction} by {abs(scroll_amount)} pixels")
+
+    async def _switch_tab(
+        self, context: BrowserContext, tab_id: Optional[int]
+    ) -> ToolResult:
+        if tab_id is None:
+            return ToolResult(error="Tab ID is required for 'switch_tab' action")
+        await context.switch_to_tab(tab_id)
+        return ToolResult(output=f"Switched to tab {tab_id}")
+
+    async def _new_tab(self, context: BrowserContext, url: Optional[str]) -> ToolResult:
+        if not url:
+            return ToolResult(error="URL is required for 'new_tab' action")
+        await context.create_new_tab(url)
+        return ToolResult(output=f"Opened new tab with URL {url}")
+
+    async def _close_tab(self, context: BrowserContext) -> ToolResult:
+        await context.close_current_tab()
+        return ToolResult(output="Closed current tab")
+
+    async def _refresh(self, context: BrowserContext) -> ToolResult:
+        await context.refresh_page()
+        return ToolResult(output="Refreshed current page")
+
+    # Handler for each action and the arguments it takes, so only those are forwarded
+    _DISPATCH: ClassVar[Dict[str, Tuple[_ActionHandler, Tuple[str, ...]]]] = {
+        "navigate": (_navigate, ("url",)),
+        "click": (_click, ("index",)),
+        "input_text": (_input_text, ("index", "text")),
+        "screenshot": (_screenshot, ()),
+        "get_html": (_get_html, ()),
+        "get_text": (_get_text, ()),
+        "read_links": (_read_links, ()),
+        "execute_js": (_execute_js, ("script",)),
+        "scroll": (_scroll, ("scroll_amount",)),
+        "switch_tab": (_switch_tab, ("tab_id",)),
+        "new_tab": (_new_tab, ("url",)),
+        "close_tab": (_close_tab, ()),
+        "refresh": (_refresh, ()),
+    }
+
     async def get_current_state(self) -> ToolResult:
         """Get the current browser state as a ToolResult."""
         async with self.lock:
@@ -296,10 +370,11 @@ class BrowserUseTool(BaseTool):
                 state_info = {
                     "url": state.url,
                     "title": state.title,
-                    "tabs": [tab.model_dump() for tab in state.tabs],
+                    "tabs": state.tabs,
                     "interactive_elements": state.element_tree.clickable_elements_to_string(),
                 }
-                return ToolResult(output=json.dumps(state_info))
+                # to_json serializes the tab models directly, without a dict round-trip
+                return ToolResult(output=to_json(state_info).decode())
             except Exception as e:
                 return ToolResult(error=f"Failed to get browser state: {str(e)}")
 
@@ -310,6 +385,7 @@ class BrowserUseTool(BaseTool):
                 await self.context.close()
                 self.context = None
                 self.dom_service = None
+                self.last_navigation = None
             if self.browser is not None:
                 await self.browser.close()
                 self.browser = None
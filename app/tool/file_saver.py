@@ -1,10 +1,29 @@
+import asyncio
 import os
 
-import aiofiles
-
 from app.tool.base import BaseTool
 
 
+_WRITE_CHUNK = 1 << 20
+
+
+def _write_file(file_path: str, data: bytes, mode: str) -> None:
+    """Create parent directories and write `data` in chunks, without copying it."""
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if mode == "a" else os.O_TRUNC)
+    fd = os.open(file_path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view[:_WRITE_CHUNK])
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
 class FileSaver(BaseTool):
     name: str = "file_saver"
     description: str = """Save content to a local file at a specified path.
@@ -45,14 +64,11 @@ The tool accepts content and a file path, and saves the content to that location
             str: A message indicating the result of the operation.
         """
         try:
-            # Ensure the directory exists
-            directory = os.path.dirname(file_path)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory)
-
-            # Write directly to the file
-            async with aiofiles.open(file_path, mode, encoding="utf-8") as file:
-                await file.write(content)
+            data = content.encode("utf-8")
+            # Directory creation and the write both run off the event loop
+            await asyncio.get_running_loop().run_in_executor(
+                None, _write_file, file_path, data, mode
+            )
 
             return f"Content successfully saved to {file_path}"
         except Exception as e:
@@ -1,11 +1,88 @@
 import asyncio
-from typing import List
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
 
 from googlesearch import search
 
 from app.tool.base import BaseTool
 
 
+class _CountMinSketch:
+    """Approximate access counts with 4-bit counters that are halved periodically."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+        self._additions = 0
+        self._reset_after = 10 * width
+
+    def _indexes(self, key: Hashable):
+        return [hash((i, key)) % self.width for i in range(self.depth)]
+
+    def add(self, key: Hashable) -> None:
+        for row, i in zip(self._rows, self._indexes(key)):
+            if row[i] < 15:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._reset_after:
+            # Age every counter so keys that were popular long ago fade out
+            for row in self._rows:
+                row[:] = [count >> 1 for count in row]
+            self._additions //= 2
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(key)))
+
+
+class _TinyLFUCache:
+    """TTL cache that only admits a new key if it is used more often than the victim."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Tuple[str, ...]]] = {}
+        self._sketch = _CountMinSketch()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> Optional[Tuple[str, ...]]:
+        self._sketch.add(key)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] < time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Tuple[str, ...]) -> None:
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            now = time.monotonic()
+            for expired in [k for k, (exp, _) in self._entries.items() if exp < now]:
+                del self._entries[expired]
+
+            if len(self._entries) >= self.maxsize:
+                estimate = self._sketch.estimate
+                victim = min(self._entries, key=estimate)
+                # One-off queries must not push out results that keep being reused
+                if estimate(key) <= estimate(victim):
+                    return
+                del self._entries[victim]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+
+# Agents often repeat the same query within a task; reuse recent results
+_search_cache = _TinyLFUCache(maxsize=128, ttl=600)
+
+
 class GoogleSearch(BaseTool):
     name: str = "google_search"
     description: str = """Perform a Google search and return a list of relevant links.
@@ -39,10 +116,14 @@ The tool returns a list of URLs that match the search query.
         Returns:
             List[str]: A list of URLs matching the search query.
         """
-        # Run the search in a thread pool to prevent blocking
-        loop = asyncio.get_event_loop()
-        links = await loop.run_in_executor(
-            None, lambda: list(search(query, num_results=num_results))
-        )
+        key = (query, num_results)
+        links = _search_cache.get(key)
+        if links is None:
+            # Run the search in a thread pool to prevent blocking
+            loop = asyncio.get_event_loop()
+            links = await loop.run_in_executor(
+                None, lambda: tuple(search(query, num_results=num_results))
+            )
+            _search_cache.set(key, links)
 
-        return links
+        return list(links)
@@ -1,4 +1,5 @@
 # tool/planning.py
+from collections import Counter
 from typing import Dict, List, Literal, Optional
 
 from app.exceptions import ToolError
@@ -10,6 +11,13 @@ A planning tool that allows the agent to create and manage plans for solving com
 The tool provides functionality for creating plans, updating plan steps, and tracking progress.
 """
 
+_STATUS_SYMBOLS = {
+    "not_started": "[ ]",
+    "in_progress": "[→]",
+    "completed": "[✓]",
+    "blocked": "[!]",
+}
+
 
 class PlanningTool(BaseTool):
     """
@@ -213,17 +221,15 @@ class PlanningTool(BaseTool):
                 output="No plans available. Create a plan with the 'create' command."
             )
 
-        output = "Available plans:\n"
+        lines = ["Available plans:\n"]
         for plan_id, plan in self.plans.items():
             current_marker = " (active)" if plan_id == self._current_plan_id else ""
-            completed = sum(
-                1 for status in plan["step_statuses"] if status == "completed"
-            )
+            completed = plan["step_statuses"].count("completed")
             total = len(plan["steps"])
             progress = f"{completed}/{total} steps completed"
-            output += f"• {plan_id}{current_marker}: {plan['title']} - {progress}\n"
+            lines.append(f"• {plan_id}{current_marker}: {plan['title']} - {progress}\n")
 
-        return ToolResult(output=output)
+        return ToolResult(output="".join(lines))
 
     def _get_plan(self, plan_id: Optional[str]) -> ToolResult:
         """Get details of a specific plan."""
@@ -321,43 +327,33 @@ class PlanningTool(BaseTool):
 
     def _format_plan(self, plan: Dict) -> str:
         """Format a plan for display."""
-        output = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
-        output += "=" * len(output) + "\n\n"
+        header = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
+        parts = [header, "=" * len(header), "\n\n"]
 
-        # Calculate progress statistics
+        # Calculate progress statistics in a single pass over the statuses
         total_steps = len(plan["steps"])
-        completed = sum(1 for status in plan["step_statuses"] if status == "completed")
-        in_progress = sum(
-            1 for status in plan["step_statuses"] if status == "in_progress"
-        )
-        blocked = sum(1 for status in plan["step_statuses"] if status == "blocked")
-        not_started = sum(
-            1 for status in plan["step_statuses"] if status == "not_started"
-        )
+        counts = Counter(plan["step_statuses"])
+        completed = counts["completed"]
 
-        output += f"Progress: {completed}/{total_steps} steps completed "
+        parts.append(f"Progress: {completed}/{total_steps} steps completed ")
         if total_steps > 0:
             percentage = (completed / total_steps) * 100
-            output += f"({percentage:.1f}%)\n"
+            parts.append(f"({percentage:.1f}%)\n")
         else:
-            output += "(0%)\n"
+            parts.append("(0%)\n")
 
-        output += f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
-        output += "Steps:\n"
+        parts.append(
+            f"Status: {completed} completed, {counts['in_progress']} in progress, {counts['blocked']} blocked, {counts['not_started']} not started\n\n"
+        )
+        parts.append("Steps:\n")
 
         # Add each step with its status and notes
         for i, (step, status, notes) in enumerate(
             zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
         ):
-            status_symbol = {
-                "not_started": "[ ]",
-                "in_progress": "[→]",
-                "completed": "[✓]",
-                "blocked": "[!]",
-            }.get(status, "[ ]")
-
-            output += f"{i}. {status_symbol} {step}\n"
+            status_symbol = _STATUS_SYMBOLS.get(status, "[ ]")
+            parts.append(f"{i}. {status_symbol} {step}\n")
             if notes:
-                output += f"   Notes: {notes}\n"
+                parts.append(f"   Notes: {notes}\n")
 
-        return output
+        return "".join(parts)
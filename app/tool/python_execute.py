@@ -1,9 +1,42 @@
-import threading
+import asyncio
+import json
+import sys
 from typing import Dict
 
 from app.tool.base import BaseTool
 
 
+# Runs in a bare `python -I` child so executing code never imports the app.
+# The code arrives on stdin and the result is written as the last stdout line.
+_RUNNER = """
+import builtins
+import io
+import json
+import sys
+
+code = sys.stdin.buffer.read().decode("utf-8")
+result = {"observation": ""}
+try:
+    safe_globals = {"__builtins__": dict(vars(builtins))}
+
+    output_buffer = io.StringIO()
+    sys.stdout = output_buffer
+
+    exec(code, safe_globals, {})
+
+    sys.stdout = sys.__stdout__
+
+    result["observation"] = output_buffer.getvalue()
+
+except Exception as e:
+    sys.stdout = sys.__stdout__
+    result["observation"] = str(e)
+    result["success"] = False
+
+sys.stdout.write("\\n" + json.dumps(result))
+"""
+
+
 class PythonExecute(BaseTool):
     """A tool for executing Python code with timeout and safety restrictions."""
 
@@ -28,6 +61,9 @@ class PythonExecute(BaseTool):
         """
         Executes the provided Python code with a timeout.
 
+        The code runs in a separate, isolated interpreter so it cannot block the
+        event loop, and is killed if it does not finish within the timeout.
+
         Args:
             code (str): The Python code to execute.
             timeout (int): Execution timeout in seconds.
@@ -35,36 +71,34 @@ class PythonExecute(BaseTool):
         Returns:
             Dict: Contains 'output' with execution output or error message and 'success' status.
         """
-        result = {"observation": ""}
-
-        def run_code():
-            try:
-                safe_globals = {"__builtins__": dict(__builtins__)}
-
-                import sys
-                from io import StringIO
-
-                output_buffer = StringIO()
-                sys.stdout = output_buffer
-
-                exec(code, safe_globals, {})
-
-                sys.stdout = sys.__stdout__
-
-                result["observation"] = output_buffer.getvalue()
-
-            except Exception as e:
-                result["observation"] = str(e)
-                result["success"] = False
-
-        thread = threading.Thread(target=run_code)
-        thread.start()
-        thread.join(timeout)
-
-        if thread.is_alive():
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-I",
+            "-c",
+            _RUNNER,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            stdout, _ = await asyncio.wait_for(
+                process.communicate(code.encode("utf-8")), timeout
+            )
+        except asyncio.TimeoutError:
             return {
                 "observation": f"Execution timeout after {timeout} seconds",
                 "success": False,
             }
-
-        return result
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+        try:
+            return json.loads(stdout.rpartition(b"\n")[2])
+        except ValueError:
+            # The child died, or wrote to the real stdout, before sending a result
+            return {
+                "observation": f"Execution exited with code {process.returncode}",
+                "success": False,
+            }
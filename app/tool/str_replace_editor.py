@@ -1,3 +1,4 @@
+import asyncio
 from collections import defaultdict
 from pathlib import Path
 from typing import Literal, get_args
@@ -173,7 +174,7 @@ class StrReplaceEditor(BaseTool):
                 stdout = f"Here's the files and directories up to 2 levels deep in {path}, excluding hidden items:\n{stdout}\n"
             return CLIResult(output=stdout, error=stderr)
 
-        file_content = self.read_file(path)
+        file_content = await asyncio.to_thread(self.read_file, path)
         init_line = 1
         if view_range:
             if len(view_range) != 2 or not all(isinstance(i, int) for i in view_range):
@@ -239,7 +240,7 @@ class StrReplaceEditor(BaseTool):
         self._file_history[path].append(file_content)
 
         # Create a snippet of the edited section
-        replacement_line = file_content.split(old_str)[0].count("\n")
+        replacement_line = file_content.count("\n", 0, file_content.index(old_str))
         start_line = max(0, replacement_line - SNIPPET_LINES)
         end_line = replacement_line + SNIPPET_LINES + new_str.count("\n")
         snippet = "\n".join(new_file_content.split("\n")[start_line : end_line + 1])
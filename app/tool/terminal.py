@@ -1,11 +1,18 @@
 import asyncio
 import os
+import re
 import shlex
 from typing import Optional
 
+from pydantic import Field
+
 from app.tool.base import BaseTool, CLIResult
 
 
+_DANGEROUS_COMMANDS = frozenset({"rm", "sudo", "shutdown", "reboot"})
+_DANGEROUS_COMMANDS_RE = re.compile("|".join(sorted(_DANGEROUS_COMMANDS)))
+
+
 class Terminal(BaseTool):
     name: str = "execute_command"
     description: str = """Request to execute a CLI command on the system.
@@ -27,7 +34,7 @@ Note: You MUST append a `sleep 0.05` to the end of the command for commands that
     }
     process: Optional[asyncio.subprocess.Process] = None
     current_path: str = os.getcwd()
-    lock: asyncio.Lock = asyncio.Lock()
+    lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
 
     async def execute(self, command: str) -> CLIResult:
         """
@@ -147,14 +154,14 @@ Note: You MUST append a `sleep 0.05` to the end of the command for commands that
             str: The sanitized command.
         """
         # Example sanitization: restrict certain dangerous commands
-        dangerous_commands = ["rm", "sudo", "shutdown", "reboot"]
         try:
             parts = shlex.split(command)
-            if any(cmd in dangerous_commands for cmd in parts):
-                raise ValueError("Use of dangerous commands is restricted.")
-        except Exception as e:
+        except ValueError:
             # If shlex.split fails, try basic string comparison
-            if any(cmd in command for cmd in dangerous_commands):
+            if _DANGEROUS_COMMANDS_RE.search(command):
+                raise ValueError("Use of dangerous commands is restricted.")
+        else:
+            if not _DANGEROUS_COMMANDS.isdisjoint(parts):
                 raise ValueError("Use of dangerous commands is restricted.")
 
         # Additional sanitization logic can be added here
@@ -4,6 +4,14 @@ from app.tool.base import BaseTool
 _TERMINATE_DESCRIPTION = """Terminate the interaction when the request is met OR if the assistant cannot proceed further with the task.
 When you have finished all the tasks, call this tool to end the work."""
 
+_TERMINATE_TEMPLATE = "The interaction has been completed with status: {status}"
+
+# Responses for the statuses in the schema enum, built once
+_TERMINATE_RESPONSES = {
+    status: _TERMINATE_TEMPLATE.format(status=status)
+    for status in ("success", "failure")
+}
+
 
 class Terminate(BaseTool):
     name: str = "terminate"
@@ -22,4 +30,6 @@ class Terminate(BaseTool):
 
     async def execute(self, status: str) -> str:
         """Finish the current execution"""
-        return f"The interaction has been completed with status: {status}"
+        return _TERMINATE_RESPONSES.get(status) or _TERMINATE_TEMPLATE.format(
+            status=status
+        )
@@ -1,5 +1,7 @@
 """Collection classes for managing multiple tools."""
-from typing import Any, Dict, List
+import asyncio
+from itertools import groupby
+from typing import Any, Dict, List, Optional
 
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, ToolFailure, ToolResult
@@ -11,12 +13,16 @@ class ToolCollection:
     def __init__(self, *tools: BaseTool):
         self.tools = tools
         self.tool_map = {tool.name: tool for tool in tools}
+        self._params: Optional[List[Dict[str, Any]]] = None
 
     def __iter__(self):
         return iter(self.tools)
 
     def to_params(self) -> List[Dict[str, Any]]:
-        return [tool.to_param() for tool in self.tools]
+        # Tool schemas are static, so build them once instead of on every LLM call
+        if self._params is None:
+            self._params = [tool.to_param() for tool in self.tools]
+        return self._params
 
     async def execute(
         self, *, name: str, tool_input: Dict[str, Any] = None
@@ -30,15 +36,32 @@ class ToolCollection:
         except ToolError as e:
             return ToolFailure(error=e.message)
 
-    async def execute_all(self) -> List[ToolResult]:
-        """Execute all tools in the collection sequentially."""
-        results = []
-        for tool in self.tools:
+    async def execute_all(
+        self, concurrent_tool_names: Optional[List[str]] = None
+    ) -> List[ToolResult]:
+        """Execute all tools in the collection in order.
+
+        Adjacent tools named in `concurrent_tool_names` are side-effect free and
+        run concurrently; everything else runs sequentially since tools may
+        depend on each other's side effects.
+        """
+        concurrent_tool_names = concurrent_tool_names or []
+
+        async def run(tool: BaseTool) -> ToolResult:
             try:
-                result = await tool()
-                results.append(result)
+                return await tool()
             except ToolError as e:
-                results.append(ToolFailure(error=e.message))
+                return ToolFailure(error=e.message)
+
+        results = []
+        for concurrent, tools in groupby(
+            self.tools, key=lambda tool: tool.name in concurrent_tool_names
+        ):
+            if concurrent:
+                results.extend(await asyncio.gather(*(run(tool) for tool in tools)))
+            else:
+                for tool in tools:
+                    results.append(await run(tool))
         return results
 
     def get_tool(self, name: str) -> BaseTool:
@@ -47,6 +70,7 @@ class ToolCollection:
     def add_tool(self, tool: BaseTool):
         self.tools += (tool,)
         self.tool_map[tool.name] = tool
+        self._params = None
         return self
 
     def add_tools(self, *tools: BaseTool):
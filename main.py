@@ -5,19 +5,30 @@ from app.logger import logger
 
 
 async def main():
-    agent = Manus()
+    agent = None
     try:
         prompt = input("Enter your prompt: ")
         if not prompt.strip():
             logger.warning("Empty prompt provided.")
             return
 
+        # Build the agent only once there is work for it
+        agent = Manus()
         logger.warning("Processing your request...")
         await agent.run(prompt)
         logger.info("Request processing completed.")
     except KeyboardInterrupt:
         logger.warning("Operation interrupted.")
+    finally:
+        # Close the browser in this event loop instead of at interpreter exit
+        if agent is not None:
+            await agent.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
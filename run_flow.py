@@ -8,17 +8,17 @@ from app.logger import logger
 
 
 async def run_flow():
-    agents = {
-        "manus": Manus(),
-    }
+    agents = {}
 
     try:
         prompt = input("Enter your prompt: ")
 
-        if prompt.strip().isspace() or not prompt:
+        if not prompt.strip():
             logger.warning("Empty prompt provided.")
             return
 
+        # Build the agents only once there is work for them
+        agents["manus"] = Manus()
         flow = FlowFactory.create_flow(
             flow_type=FlowType.PLANNING,
             agents=agents,
@@ -44,7 +44,16 @@ async def run_flow():
         logger.info("Operation cancelled by user.")
     except Exception as e:
         logger.error(f"Error: {str(e)}")
+    finally:
+        # Close the browser in this event loop instead of at interpreter exit
+        for agent in agents.values():
+            await agent.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_flow())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(run_flow())
+    else:
+        uvloop.run(run_flow())